@@ -3,15 +3,24 @@ Neo TTS Flask Application
 Modern modular TTS system with Kokoro
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, abort, render_template, request, jsonify, send_from_directory
+from werkzeug.security import safe_join
 import os
 import sys
 import time
 import json
 import csv
+import base64
 from pathlib import Path
 import importlib
 import logging
+import queue
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from urllib.parse import quote
 from device_utils import (
     get_device_info, monitor_gpu_usage, PerformanceTimer,
     log_model_device_info, setup_logging
@@ -38,6 +47,17 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(LOGS_DIR, exist_ok=True)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Let a reverse proxy serve generated audio with sendfile(2) instead of Flask:
+# NEO_TTS_ACCEL_REDIRECT names an nginx internal location (e.g. /_internal_audio/),
+# NEO_TTS_X_SENDFILE=1 enables X-Sendfile for Apache/lighttpd
+AUDIO_ACCEL_REDIRECT = os.environ.get("NEO_TTS_ACCEL_REDIRECT")
+app.config["USE_X_SENDFILE"] = os.environ.get("NEO_TTS_X_SENDFILE") == "1"
+
+# Generation log, opened on first use and kept open (line-buffered) for the lifetime of the process
+LOG_FILE = os.path.join(LOGS_DIR, "results.csv")
+_log_writer = None
+_log_lock = threading.Lock()
+
 # Model registry
 MODELS = {
     "kokoro": {
@@ -47,48 +67,135 @@ MODELS = {
     }
 }
 
-# Cache for loaded model modules
-_model_modules = {}
-
+@lru_cache(maxsize=None)
 def get_model_module(model_name):
-    """Load model module dynamically."""
-    if model_name not in _model_modules:
-        if model_name not in MODELS:
-            raise ValueError(f"Unknown model: {model_name}")
+    """Load model module dynamically (cached per model name)."""
+    if model_name not in MODELS:
+        raise ValueError(f"Unknown model: {model_name}")
 
-        module_name = MODELS[model_name]["module"]
-        try:
-            _model_modules[model_name] = importlib.import_module(module_name)
-        except ImportError as e:
-            raise RuntimeError(f"Failed to load model {model_name}: {e}")
+    module_name = MODELS[model_name]["module"]
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise RuntimeError(f"Failed to load model {model_name}: {e}")
+
+class BatchedStreamer:
+    """Queue generation requests and serve them from a single worker thread.
+
+    Kokoro synthesizes one utterance at a time, so the worker picks each
+    request individually: before every generation it sorts all queued
+    arrivals into text-length buckets and serves the head of the shortest
+    non-empty bucket. A short prompt therefore waits for at most the one
+    generation already in progress. Once a request has waited ``max_wait``
+    seconds, the oldest request is served first regardless of length, so long
+    prompts are not starved.
+    """
+
+    # Upper bounds (in characters) of the text-length buckets
+    LENGTH_BUCKETS = (32, 128, 512, float("inf"))
+
+    # Queue sentinel asking the worker to exit
+    _STOP = object()
+
+    def __init__(self, max_wait: float = 2.0):
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._buckets = [deque() for _ in self.LENGTH_BUCKETS]
+        self._stopping = False
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, model_name, text, voice, output_path) -> Future:
+        """Enqueue a generation request and return a Future for its result."""
+        with self._start_lock:
+            # Start the worker on first use so importing the app spawns no threads
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="neo-tts-batcher", daemon=True)
+                self._worker.start()
+
+        future = Future()
+        self._queue.put((model_name, text, voice, output_path, future, time.monotonic()))
+        return future
+
+    def close(self, timeout: float = None):
+        """Stop the worker after the requests already submitted have been served."""
+        with self._start_lock:
+            worker = self._worker
+        if worker is not None:
+            self._queue.put(self._STOP)
+            worker.join(timeout)
+
+    def _receive(self, item):
+        """Place a queued item in the bucket matching its text length."""
+        if item is self._STOP:
+            self._stopping = True
+            return
+        length = len(item[1])
+        index = next(i for i, bound in enumerate(self.LENGTH_BUCKETS) if length <= bound)
+        self._buckets[index].append(item)
+
+    def _next_task(self):
+        """Drain every arrival into the buckets, then pick the next request to serve."""
+        while not any(self._buckets):
+            if self._stopping:
+                return None
+            self._receive(self._queue.get())
+
+        while True:
+            try:
+                self._receive(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Buckets are ordered short to long; an overdue request overrides that order
+        waiting = [b for b in self._buckets if b]
+        oldest = min(waiting, key=lambda b: b[0][5])
+        if time.monotonic() - oldest[0][5] >= self.max_wait:
+            return oldest.popleft()
+        return waiting[0].popleft()
+
+    def _run(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            model_name, text, voice, output_path, future, _ = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                module = get_model_module(model_name)
+                result = module.generate_audio(text, voice, output_path)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
 
-    return _model_modules[model_name]
+# Shared generation worker for /api/generate (its thread starts on the first request)
+streamer = BatchedStreamer()
 
-def log_generation(model, speaker, text, output_path):
-    """Log generation to CSV."""
-    log_file = os.path.join(LOGS_DIR, "results.csv")
-    file_exists = os.path.exists(log_file)
+def output_filename(model_name):
+    """Return a unique WAV filename for a generation request."""
+    return f"{model_name}_{int(time.time())}_{uuid.uuid4().hex[:8]}.wav"
 
-    duration = 0.0
-    try:
-        import soundfile as sf
-        audio, sr = sf.read(output_path)
-        duration = len(audio) / sr
-    except:
-        pass
-
-    with open(log_file, 'a', newline='') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["timestamp", "model", "speaker", "text", "duration", "output_path"])
-        writer.writerow([
-            time.strftime("%Y-%m-%d %H:%M:%S"),
-            model,
-            speaker or "default",
-            text[:100] + "..." if len(text) > 100 else text,
-            f"{duration:.2f}",
-            output_path
-        ])
+def log_generation(model, speaker, text, output_path, duration):
+    """Log generation to CSV."""
+    row = [
+        time.strftime("%Y-%m-%d %H:%M:%S"),
+        model,
+        speaker or "default",
+        text[:100] + "..." if len(text) > 100 else text,
+        f"{duration:.2f}",
+        output_path
+    ]
+    global _log_writer
+    with _log_lock:
+        if _log_writer is None:
+            needs_header = not os.path.exists(LOG_FILE) or os.path.getsize(LOG_FILE) == 0
+            _log_writer = csv.writer(open(LOG_FILE, 'a', newline='', buffering=1))
+            if needs_header:
+                _log_writer.writerow(["timestamp", "model", "speaker", "text", "duration", "output_path"])
+        _log_writer.writerow(row)
 
 @app.route("/")
 def index():
@@ -134,37 +241,23 @@ def generate_audio():
         if not text:
             return jsonify({"error": "Text is required"}), 400
 
-        # Load model module
-        module = get_model_module(model_name)
-
         # Generate unique filename
-        timestamp = int(time.time())
-        filename = f"{model_name}_{timestamp}.wav"
+        filename = output_filename(model_name)
         output_path = os.path.join(OUTPUT_DIR, filename)
 
         # Performance timing and device monitoring
         generation_start = time.time()
-        gpu_usage_before = monitor_gpu_usage()
 
         try:
             # Generate audio
             with PerformanceTimer(f"{model_name} generation ({voice or 'default'})"):
-                result_path = module.generate_audio(text, voice, output_path)
+                result_path, audio_duration = streamer.submit(model_name, text, voice, output_path).result()
 
             generation_time = time.time() - generation_start
             gpu_usage_after = monitor_gpu_usage()
 
-            # Calculate audio duration
-            audio_duration = 0.0
-            try:
-                import soundfile as sf
-                audio, sr = sf.read(result_path)
-                audio_duration = len(audio) / sr
-            except:
-                pass
-
             # Log the generation with performance info
-            log_generation(model_name, voice, text, result_path)
+            log_generation(model_name, voice, text, result_path, audio_duration)
 
             # Return relative path for web access
             web_path = f"/static/output/{filename}"
@@ -179,15 +272,88 @@ def generate_audio():
 
         except Exception as e:
             generation_time = time.time() - generation_start
-            app.logger.error(".2f")
+            app.logger.error(f"{model_name} generation failed after {generation_time:.2f}s: {e}")
             raise e
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _sse(payload):
+    """Format a payload as a Server-Sent Events message."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+@app.route("/api/generate_stream", methods=["POST"])
+def generate_audio_stream():
+    """
+    Stream generated audio as Server-Sent Events.
+    The first event carries the sample rate, each following event a base64
+    chunk of 16-bit mono PCM, and the last one the URL of the saved WAV.
+    """
+    try:
+        data = request.json
+        model_name = data.get("model")
+        voice = data.get("voice")
+        text = data.get("text", "").strip()
+
+        if not model_name or model_name not in MODELS:
+            return jsonify({"error": "Invalid model"}), 400
+
+        if not text:
+            return jsonify({"error": "Text is required"}), 400
+
+        module = get_model_module(model_name)
+        if not hasattr(module, "stream_audio"):
+            return jsonify({"error": f"Streaming not supported for {model_name}"}), 400
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    filename = output_filename(model_name)
+    output_path = os.path.join(OUTPUT_DIR, filename)
+
+    def events():
+        generation_start = time.time()
+        num_samples = 0
+        yield _sse({"sample_rate": module.SAMPLE_RATE})
+
+        try:
+            for pcm in module.stream_audio(text, voice, output_path):
+                num_samples += len(pcm)
+                yield _sse({"pcm_b64": base64.b64encode(pcm.tobytes()).decode("ascii")})
+        except Exception as e:
+            generation_time = time.time() - generation_start
+            app.logger.error(f"{model_name} streaming failed after {generation_time:.2f}s: {e}")
+            yield _sse({"error": str(e)})
+            return
+
+        generation_time = time.time() - generation_start
+        audio_duration = num_samples / module.SAMPLE_RATE
+        log_generation(model_name, voice, text, output_path, audio_duration)
+
+        yield _sse({
+            "done": True,
+            "audio_url": f"/static/output/{filename}",
+            "model": model_name,
+            "voice": voice,
+            "audio_duration": round(audio_duration, 2),
+            "generation_time": round(generation_time, 2)
+        })
+
+    return Response(events(), mimetype="text/event-stream")
+
 @app.route("/static/output/<path:filename>")
 def serve_audio(filename):
     """Serve generated audio files."""
+    if AUDIO_ACCEL_REDIRECT:
+        path = safe_join(OUTPUT_DIR, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        # nginx streams the file itself from its internal location
+        return Response(headers={
+            "X-Accel-Redirect": AUDIO_ACCEL_REDIRECT.rstrip("/") + "/" + quote(filename),
+            "Content-Type": "audio/wav"
+        })
+
     return send_from_directory(OUTPUT_DIR, filename)
 
 if __name__ == "__main__":
@@ -2,17 +2,59 @@
 Device utilities for GPU/CPU monitoring and management
 """
 
-import torch
 import time
-import psutil
 import platform
+import threading
+import functools
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# torch and psutil are imported on first use so importing this module stays cheap
+_torch = None
+_psutil = None
+
+def _get_torch():
+    """Import torch on first use and cache the module."""
+    global _torch
+    if _torch is None:
+        import torch
+        _torch = torch
+    return _torch
+
+def _get_psutil():
+    """Import psutil on first use and cache the module."""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+def _ttl_cache(seconds: float):
+    """Cache a zero-argument function's result for the given number of seconds."""
+    def decorator(func):
+        lock = threading.Lock()
+        value = None
+        expires_at = 0.0
+
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal value, expires_at
+            with lock:
+                now = time.monotonic()
+                if now >= expires_at:
+                    value = func()
+                    expires_at = now + seconds
+                return value
+        return wrapper
+    return decorator
+
+@_ttl_cache(seconds=1.0)
 def get_device_info() -> Dict[str, Any]:
     """Get comprehensive device information."""
+    torch = _get_torch()
+    psutil = _get_psutil()
     info = {
         "platform": platform.system(),
         "cpu_count": psutil.cpu_count(),
@@ -55,6 +97,7 @@ def get_device_info() -> Dict[str, Any]:
 
 def get_optimal_device():
     """Get the optimal device for computation."""
+    torch = _get_torch()
     if torch.cuda.is_available():
         return torch.device("cuda")
     elif torch.backends.mps.is_available():
@@ -62,8 +105,10 @@ def get_optimal_device():
     else:
         return torch.device("cpu")
 
+@_ttl_cache(seconds=1.0)
 def monitor_gpu_usage() -> Dict[str, Any]:
     """Monitor current GPU usage."""
+    torch = _get_torch()
     usage = {}
 
     if torch.cuda.is_available():
@@ -108,9 +153,9 @@ class PerformanceTimer:
         self.end_time = time.time()
         duration = self.end_time - self.start_time
         if exc_type is None:
-            logger.info(".2f")
+            logger.info(f"{self.operation_name} completed in {duration:.2f}s")
         else:
-            logger.error(".2f")
+            logger.error(f"{self.operation_name} failed after {duration:.2f}s: {exc_val}")
 
     @property
     def duration(self):
@@ -5,11 +5,16 @@ Supports multiple voice presets (male/female)
 """
 
 import os
+import contextlib
+import copy
+import functools
 import torch
 import numpy as np
 import soundfile as sf
 from pathlib import Path
 import sys
+import threading
+import uuid
 import warnings
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.device_utils import get_optimal_device, log_model_device_info
@@ -22,8 +27,199 @@ warnings.filterwarnings("ignore", message=".*torch.nn.utils.weight_norm.*depreca
 MODEL_CACHE = Path("models/kokoro_cache")
 VOICES_DIR = MODEL_CACHE / "voices"
 
+# Kokoro outputs 24kHz audio
+SAMPLE_RATE = 24000
+
+# Number of distinct texts whose grapheme-to-phoneme results are kept
+G2P_CACHE_SIZE = 1024
+
+# Raw voice codes to formatted display names (flag, gender, quality grade)
+_VOICE_FORMATS = {
+    # American English
+    'af_alloy': '🇺🇸 Alloy 🚺 (C)',
+    'af_aoede': '🇺🇸 Aoede 🚺 (C+)',
+    'af_bella': '🇺🇸 Bella 🚺🔥 (A-)',
+    'af_heart': '🇺🇸 Heart 🚺❤️ (A)',
+    'af_jessica': '🇺🇸 Jessica 🚺 (D)',
+    'af_kore': '🇺🇸 Kore 🚺 (C+)',
+    'af_nicole': '🇺🇸 Nicole 🚺🎧 (B-)',
+    'af_nova': '🇺🇸 Nova 🚺 (C)',
+    'af_river': '🇺🇸 River 🚺 (D)',
+    'af_sarah': '🇺🇸 Sarah 🚺 (C+)',
+    'af_sky': '🇺🇸 Sky 🚺 (C-)',
+
+    'am_adam': '🇺🇸 Adam 🚹 (F+)',
+    'am_echo': '🇺🇸 Echo 🚹 (D)',
+    'am_eric': '🇺🇸 Eric 🚹 (D)',
+    'am_fenrir': '🇺🇸 Fenrir 🚹 (C+)',
+    'am_liam': '🇺🇸 Liam 🚹 (D)',
+    'am_michael': '🇺🇸 Michael 🚹 (C+)',
+    'am_onyx': '🇺🇸 Onyx 🚹 (D)',
+    'am_puck': '🇺🇸 Puck 🚹 (C+)',
+    'am_santa': '🇺🇸 Santa 🚹 (D-)',
+
+    # British English
+    'bf_alice': '🇬🇧 Alice 🚺 (D)',
+    'bf_emma': '🇬🇧 Emma 🚺 (B-)',
+    'bf_isabella': '🇬🇧 Isabella 🚺 (C)',
+    'bf_lily': '🇬🇧 Lily 🚺 (D)',
+
+    'bm_daniel': '🇬🇧 Daniel 🚹 (D)',
+    'bm_fable': '🇬🇧 Fable 🚹 (C)',
+    'bm_george': '🇬🇧 George 🚹 (C)',
+    'bm_lewis': '🇬🇧 Lewis 🚹 (D+)',
+
+    # Japanese
+    'jf_alpha': '🇯🇵 Alpha 🚺 (C+)',
+    'jf_gongitsune': '🇯🇵 Gongitsune 🚺 (C)',
+    'jf_nezumi': '🇯🇵 Nezumi 🚺 (C-)',
+    'jf_tebukuro': '🇯🇵 Tebukuro 🚺 (C)',
+    'jm_kumo': '🇯🇵 Kumo 🚹 (C-)',
+
+    # Mandarin Chinese
+    'zf_xiaobei': '🇨🇳 Xiaobei 🚺 (D)',
+    'zf_xiaoni': '🇨🇳 Xiaoni 🚺 (D)',
+    'zf_xiaoxiao': '🇨🇳 Xiaoxiao 🚺 (D)',
+    'zf_xiaoyi': '🇨🇳 Xiaoyi 🚺 (D)',
+    'zm_yunjian': '🇨🇳 Yunjian 🚹 (D)',
+    'zm_yunxi': '🇨🇳 Yunxi 🚹 (D)',
+    'zm_yunxia': '🇨🇳 Yunxia 🚹 (D)',
+    'zm_yunyang': '🇨🇳 Yunyang 🚹 (D)',
+
+    # Spanish
+    'ef_dora': '🇪🇸 Dora 🚺',
+    'em_alex': '🇪🇸 Alex 🚹',
+    'em_santa': '🇪🇸 Santa 🚹',
+
+    # French
+    'ff_siwis': '🇫🇷 Siwis 🚺 (B-)',
+
+    # Hindi
+    'hf_alpha': '🇮🇳 Alpha 🚺 (C)',
+    'hf_beta': '🇮🇳 Beta 🚺 (C)',
+    'hm_omega': '🇮🇳 Omega 🚹 (C)',
+    'hm_psi': '🇮🇳 Psi 🚹 (C)',
+
+    # Italian
+    'if_sara': '🇮🇹 Sara 🚺 (C)',
+    'im_nicola': '🇮🇹 Nicola 🚹 (C)',
+
+    # Brazilian Portuguese
+    'pf_dora': '🇧🇷 Dora 🚺',
+    'pm_alex': '🇧🇷 Alex 🚹',
+    'pm_santa': '🇧🇷 Santa 🚹',
+}
+
+# Formatted display names back to raw voice codes
+_VOICE_MAPPING = {name: code for code, name in _VOICE_FORMATS.items()}
+
 # Global model instance
 _kokoro_pipeline = None
+# Device/dtype the cached voice tensors were last moved to
+_voice_device = None
+# Serializes access to the shared pipeline across request threads
+_generation_lock = threading.Lock()
+# Ensures only one thread builds (and compiles) the pipeline
+_load_lock = threading.Lock()
+
+def _place_voices(pipeline):
+    """Move loaded voice tensors to the model's device and dtype once."""
+    global _voice_device
+
+    if pipeline.model is not None:
+        param = next(pipeline.model.parameters())
+        device, dtype = param.device, param.dtype
+    else:
+        device, dtype = get_optimal_device(), torch.float32
+
+    if _voice_device == (device, dtype):
+        return
+
+    for voice_name, voice_tensor in pipeline.voices.items():
+        if device.type == "cuda" and voice_tensor.device.type == "cpu":
+            # Pinned host memory lets the initial host-to-device copy run async
+            voice_tensor = voice_tensor.pin_memory()
+        pipeline.voices[voice_name] = voice_tensor.to(device=device, dtype=dtype, non_blocking=True)
+
+    _voice_device = (device, dtype)
+
+def _fp32_forward(forward):
+    """Wrap a module forward to run in fp32 with autocast disabled."""
+    @functools.wraps(forward)
+    def wrapper(*args, **kwargs):
+        args = [a.float() if torch.is_tensor(a) and a.is_floating_point() else a for a in args]
+        with torch.autocast(device_type="cuda", enabled=False):
+            return forward(*args, **kwargs)
+    return wrapper
+
+def _use_half_precision(pipeline):
+    """Run the Kokoro model in fp16 on CUDA, keeping the vocoder in fp32."""
+    model = pipeline.model
+    if model is None or next(model.parameters()).device.type != "cuda":
+        return
+
+    model.half()
+    # torch.stft has no half-precision path for the decoder's non power-of-two FFT size
+    model.decoder.float()
+    model.decoder.forward = _fp32_forward(model.decoder.forward)
+
+def _autocast(pipeline):
+    """Autocast context matching the model's precision (no-op in fp32)."""
+    if pipeline.model is None:
+        return contextlib.nullcontext()
+    param = next(pipeline.model.parameters())
+    if param.dtype == torch.float32:
+        return contextlib.nullcontext()
+    # Kokoro builds fp32 tensors inside forward (e.g. the alignment matrix)
+    return torch.autocast(device_type=param.device.type, dtype=param.dtype)
+
+def _cache_g2p(pipeline):
+    """Memoize the pipeline's grapheme-to-phoneme step so repeated prompts skip it."""
+    g2p = getattr(pipeline, "g2p", None)
+    if g2p is None:
+        return
+
+    # One pipeline per lang_code, so the text alone keys the cache
+    cached = functools.lru_cache(maxsize=G2P_CACHE_SIZE)(g2p)
+
+    def cached_g2p(text):
+        # Kokoro writes timestamps onto the returned tokens; keep cache entries pristine
+        return copy.deepcopy(cached(text))
+
+    pipeline.g2p = cached_g2p
+
+def _compile_model(pipeline):
+    """torch.compile the Kokoro forward on CUDA, falling back to eager on failure."""
+    model = pipeline.model
+    if model is None or next(model.parameters()).device.type != "cuda":
+        return
+
+    eager_forward = model.forward_with_tokens
+
+    def forward_with_fallback(*args, **kwargs):
+        # New input shapes can trigger a recompile at request time; if compilation
+        # fails, revert to eager for good rather than failing the request. Runtime
+        # errors (OOM, bad input) are re-raised and leave the compiled path in place.
+        try:
+            return compiled_forward(*args, **kwargs)
+        except torch._dynamo.exc.TorchDynamoException as e:
+            print(f"Warning: torch.compile failed for Kokoro ({type(e).__name__}: {e}), reverting to eager mode")
+            model.forward_with_tokens = eager_forward
+            return eager_forward(*args, **kwargs)
+
+    try:
+        compiled_forward = torch.compile(eager_forward, dynamic=True)
+        model.forward_with_tokens = forward_with_fallback
+
+        # Compilation is lazy; warm up here so the first request doesn't pay for it
+        warmup_voice = 'af_alloy' if 'af_alloy' in pipeline.voices else next(iter(pipeline.voices), None)
+        if warmup_voice is not None:
+            with _autocast(pipeline):
+                for _ in pipeline("Warm up.", voice=warmup_voice):
+                    pass
+    except Exception as e:
+        print(f"Warning: torch.compile setup failed for Kokoro ({type(e).__name__}: {e}), using eager mode")
+        model.forward_with_tokens = eager_forward
 
 def _load_kokoro_model():
     """Load Kokoro model and voices lazily."""
@@ -32,199 +228,72 @@ def _load_kokoro_model():
     if _kokoro_pipeline is not None:
         return _kokoro_pipeline
 
-    try:
-        # Import Kokoro (assuming it's installed)
-        from kokoro import KPipeline
-
-        # Create pipeline (automatically loads model)
-        pipeline = KPipeline(lang_code='a', repo_id='hexgrad/Kokoro-82M')  # American English
-
-        # Load available voices from cache
-        if VOICES_DIR.exists():
-            for voice_file in VOICES_DIR.glob("*.pt"):
-                voice_name = voice_file.stem  # e.g., 'af_alloy', 'am_adam', etc.
-                try:
-                    voice_tensor = torch.load(voice_file, weights_only=True)
-                    pipeline.voices[voice_name] = voice_tensor
-                except Exception as e:
-                    print(f"Warning: Could not load voice {voice_name}: {e}")
-
-        _kokoro_pipeline = pipeline
-        return pipeline
-
-    except ImportError:
-        raise ImportError("Kokoro not installed. Run setup-neo-tts.sh first")
-    except Exception as e:
-        raise RuntimeError(f"Failed to load Kokoro model: {e}")
+    with _load_lock:
+        # Another thread may have finished loading while we waited
+        if _kokoro_pipeline is not None:
+            return _kokoro_pipeline
+
+        try:
+            # Import Kokoro (assuming it's installed)
+            from kokoro import KPipeline
+
+            # Create pipeline (automatically loads model)
+            pipeline = KPipeline(lang_code='a', repo_id='hexgrad/Kokoro-82M')  # American English
+            _use_half_precision(pipeline)
+            _cache_g2p(pipeline)
+            if pipeline.model is not None:
+                log_model_device_info(pipeline.model, "Kokoro")
+
+            # Load available voices from cache
+            if VOICES_DIR.exists():
+                for voice_file in VOICES_DIR.glob("*.pt"):
+                    voice_name = voice_file.stem  # e.g., 'af_alloy', 'am_adam', etc.
+                    try:
+                        voice_tensor = torch.load(voice_file, weights_only=True, map_location="cpu")
+                        pipeline.voices[voice_name] = voice_tensor
+                    except Exception as e:
+                        print(f"Warning: Could not load voice {voice_name}: {e}")
+
+            # Keep voices resident next to the model so requests skip the per-call copy
+            _place_voices(pipeline)
+            _compile_model(pipeline)
+
+            _kokoro_pipeline = pipeline
+            return pipeline
+
+        except ImportError:
+            raise ImportError("Kokoro not installed. Run setup-neo-tts.sh first")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load Kokoro model: {e}")
 
 def _get_voice_mapping() -> dict:
     """Return mapping from formatted display names to raw voice codes."""
-    return {
-        # American English
-        '🇺🇸 Alloy 🚺 (C)': 'af_alloy',
-        '🇺🇸 Aoede 🚺 (C+)': 'af_aoede',
-        '🇺🇸 Bella 🚺🔥 (A-)': 'af_bella',
-        '🇺🇸 Heart 🚺❤️ (A)': 'af_heart',
-        '🇺🇸 Jessica 🚺 (D)': 'af_jessica',
-        '🇺🇸 Kore 🚺 (C+)': 'af_kore',
-        '🇺🇸 Nicole 🚺🎧 (B-)': 'af_nicole',
-        '🇺🇸 Nova 🚺 (C)': 'af_nova',
-        '🇺🇸 River 🚺 (D)': 'af_river',
-        '🇺🇸 Sarah 🚺 (C+)': 'af_sarah',
-        '🇺🇸 Sky 🚺 (C-)': 'af_sky',
-
-        '🇺🇸 Adam 🚹 (F+)': 'am_adam',
-        '🇺🇸 Echo 🚹 (D)': 'am_echo',
-        '🇺🇸 Eric 🚹 (D)': 'am_eric',
-        '🇺🇸 Fenrir 🚹 (C+)': 'am_fenrir',
-        '🇺🇸 Liam 🚹 (D)': 'am_liam',
-        '🇺🇸 Michael 🚹 (C+)': 'am_michael',
-        '🇺🇸 Onyx 🚹 (D)': 'am_onyx',
-        '🇺🇸 Puck 🚹 (C+)': 'am_puck',
-        '🇺🇸 Santa 🚹 (D-)': 'am_santa',
-
-        # British English
-        '🇬🇧 Alice 🚺 (D)': 'bf_alice',
-        '🇬🇧 Emma 🚺 (B-)': 'bf_emma',
-        '🇬🇧 Isabella 🚺 (C)': 'bf_isabella',
-        '🇬🇧 Lily 🚺 (D)': 'bf_lily',
-
-        '🇬🇧 Daniel 🚹 (D)': 'bm_daniel',
-        '🇬🇧 Fable 🚹 (C)': 'bm_fable',
-        '🇬🇧 George 🚹 (C)': 'bm_george',
-        '🇬🇧 Lewis 🚹 (D+)': 'bm_lewis',
-
-        # Japanese
-        '🇯🇵 Alpha 🚺 (C+)': 'jf_alpha',
-        '🇯🇵 Gongitsune 🚺 (C)': 'jf_gongitsune',
-        '🇯🇵 Nezumi 🚺 (C-)': 'jf_nezumi',
-        '🇯🇵 Tebukuro 🚺 (C)': 'jf_tebukuro',
-        '🇯🇵 Kumo 🚹 (C-)': 'jm_kumo',
-
-        # Mandarin Chinese
-        '🇨🇳 Xiaobei 🚺 (D)': 'zf_xiaobei',
-        '🇨🇳 Xiaoni 🚺 (D)': 'zf_xiaoni',
-        '🇨🇳 Xiaoxiao 🚺 (D)': 'zf_xiaoxiao',
-        '🇨🇳 Xiaoyi 🚺 (D)': 'zf_xiaoyi',
-        '🇨🇳 Yunjian 🚹 (D)': 'zm_yunjian',
-        '🇨🇳 Yunxi 🚹 (D)': 'zm_yunxi',
-        '🇨🇳 Yunxia 🚹 (D)': 'zm_yunxia',
-        '🇨🇳 Yunyang 🚹 (D)': 'zm_yunyang',
-
-        # Spanish
-        '🇪🇸 Dora 🚺': 'ef_dora',
-        '🇪🇸 Alex 🚹': 'em_alex',
-        '🇪🇸 Santa 🚹': 'em_santa',
-
-        # French
-        '🇫🇷 Siwis 🚺 (B-)': 'ff_siwis',
-
-        # Hindi
-        '🇮🇳 Alpha 🚺 (C)': 'hf_alpha',
-        '🇮🇳 Beta 🚺 (C)': 'hf_beta',
-        '🇮🇳 Omega 🚹 (C)': 'hm_omega',
-        '🇮🇳 Psi 🚹 (C)': 'hm_psi',
-
-        # Italian
-        '🇮🇹 Sara 🚺 (C)': 'if_sara',
-        '🇮🇹 Nicola 🚹 (C)': 'im_nicola',
-
-        # Brazilian Portuguese
-        '🇧🇷 Dora 🚺': 'pf_dora',
-        '🇧🇷 Alex 🚹': 'pm_alex',
-        '🇧🇷 Santa 🚹': 'pm_santa',
-    }
+    return _VOICE_MAPPING
+
+def list_voices_fast() -> list:
+    """Return formatted voice names from a scan of VOICES_DIR, without loading the model."""
+    if not VOICES_DIR.exists():
+        return []
+    return [_VOICE_FORMATS.get(p.stem, f"{p.stem} (Unknown)") for p in VOICES_DIR.glob("*.pt")]
 
 def list_voices() -> list:
     """
     Return a list of available speakers/voices for Kokoro.
     Returns formatted voice names with flags, genders, and quality grades.
+    Voices are read from the cache directory without loading the model.
     """
     try:
-        pipeline = _load_kokoro_model()
-        raw_voices = list(pipeline.voices.keys())
-
-        # Voice formatting mapping
-        voice_formats = {
-            # American English
-            'af_alloy': '🇺🇸 Alloy 🚺 (C)',
-            'af_aoede': '🇺🇸 Aoede 🚺 (C+)',
-            'af_bella': '🇺🇸 Bella 🚺🔥 (A-)',
-            'af_heart': '🇺🇸 Heart 🚺❤️ (A)',
-            'af_jessica': '🇺🇸 Jessica 🚺 (D)',
-            'af_kore': '🇺🇸 Kore 🚺 (C+)',
-            'af_nicole': '🇺🇸 Nicole 🚺🎧 (B-)',
-            'af_nova': '🇺🇸 Nova 🚺 (C)',
-            'af_river': '🇺🇸 River 🚺 (D)',
-            'af_sarah': '🇺🇸 Sarah 🚺 (C+)',
-            'af_sky': '🇺🇸 Sky 🚺 (C-)',
-
-            'am_adam': '🇺🇸 Adam 🚹 (F+)',
-            'am_echo': '🇺🇸 Echo 🚹 (D)',
-            'am_eric': '🇺🇸 Eric 🚹 (D)',
-            'am_fenrir': '🇺🇸 Fenrir 🚹 (C+)',
-            'am_liam': '🇺🇸 Liam 🚹 (D)',
-            'am_michael': '🇺🇸 Michael 🚹 (C+)',
-            'am_onyx': '🇺🇸 Onyx 🚹 (D)',
-            'am_puck': '🇺🇸 Puck 🚹 (C+)',
-            'am_santa': '🇺🇸 Santa 🚹 (D-)',
-
-            # British English
-            'bf_alice': '🇬🇧 Alice 🚺 (D)',
-            'bf_emma': '🇬🇧 Emma 🚺 (B-)',
-            'bf_isabella': '🇬🇧 Isabella 🚺 (C)',
-            'bf_lily': '🇬🇧 Lily 🚺 (D)',
-
-            'bm_daniel': '🇬🇧 Daniel 🚹 (D)',
-            'bm_fable': '🇬🇧 Fable 🚹 (C)',
-            'bm_george': '🇬🇧 George 🚹 (C)',
-            'bm_lewis': '🇬🇧 Lewis 🚹 (D+)',
-
-            # Japanese
-            'jf_alpha': '🇯🇵 Alpha 🚺 (C+)',
-            'jf_gongitsune': '🇯🇵 Gongitsune 🚺 (C)',
-            'jf_nezumi': '🇯🇵 Nezumi 🚺 (C-)',
-            'jf_tebukuro': '🇯🇵 Tebukuro 🚺 (C)',
-            'jm_kumo': '🇯🇵 Kumo 🚹 (C-)',
-
-            # Mandarin Chinese
-            'zf_xiaobei': '🇨🇳 Xiaobei 🚺 (D)',
-            'zf_xiaoni': '🇨🇳 Xiaoni 🚺 (D)',
-            'zf_xiaoxiao': '🇨🇳 Xiaoxiao 🚺 (D)',
-            'zf_xiaoyi': '🇨🇳 Xiaoyi 🚺 (D)',
-            'zm_yunjian': '🇨🇳 Yunjian 🚹 (D)',
-            'zm_yunxi': '🇨🇳 Yunxi 🚹 (D)',
-            'zm_yunxia': '🇨🇳 Yunxia 🚹 (D)',
-            'zm_yunyang': '🇨🇳 Yunyang 🚹 (D)',
-
-            # Spanish
-            'ef_dora': '🇪🇸 Dora 🚺',
-            'em_alex': '🇪🇸 Alex 🚹',
-            'em_santa': '🇪🇸 Santa 🚹',
-
-            # French
-            'ff_siwis': '🇫🇷 Siwis 🚺 (B-)',
-
-            # Hindi
-            'hf_alpha': '🇮🇳 Alpha 🚺 (C)',
-            'hf_beta': '🇮🇳 Beta 🚺 (C)',
-            'hm_omega': '🇮🇳 Omega 🚹 (C)',
-            'hm_psi': '🇮🇳 Psi 🚹 (C)',
-
-            # Italian
-            'if_sara': '🇮🇹 Sara 🚺 (C)',
-            'im_nicola': '🇮🇹 Nicola 🚹 (C)',
-
-            # Brazilian Portuguese
-            'pf_dora': '🇧🇷 Dora 🚺',
-            'pm_alex': '🇧🇷 Alex 🚹',
-            'pm_santa': '🇧🇷 Santa 🚹',
-        }
+        voices = list_voices_fast()
+        # Voices are only ever loaded from VOICES_DIR, so loading the model can't find more
+        if voices or _kokoro_pipeline is None:
+            return voices
+
+        raw_voices = list(_kokoro_pipeline.voices.keys())
 
         # Format voices, fallback to raw name if not in mapping
         formatted_voices = []
         for voice in raw_voices:
-            formatted = voice_formats.get(voice, f"{voice} (Unknown)")
+            formatted = _VOICE_FORMATS.get(voice, f"{voice} (Unknown)")
             formatted_voices.append(formatted)
 
         return formatted_voices
@@ -238,46 +307,107 @@ def list_voices() -> list:
             '🇬🇧 Daniel 🚹 (D)'
         ]
 
-def generate_audio(text: str, voice: str = None, output_path: str = "app/static/output/output.wav") -> str:
+def _resolve_voice(pipeline, voice: str = None) -> str:
+    """Map a formatted display name or raw code to a loaded raw voice code."""
+    if voice is None:
+        voice = 'af_alloy'  # Default to American Female
+
+    # Convert formatted voice name to raw voice code if needed
+    voice_mapping = _get_voice_mapping()
+    if voice in voice_mapping:
+        voice = voice_mapping[voice]  # Convert formatted name to raw code
+
+    if voice not in pipeline.voices:
+        raise ValueError(f"Voice '{voice}' not available. Available: {list(pipeline.voices.keys())}")
+
+    return voice
+
+def _to_pcm16(audio_np: np.ndarray) -> np.ndarray:
+    """Convert float audio in [-1, 1] to 16-bit PCM samples."""
+    # Clip into a fresh contiguous buffer (the input may be owned by the pipeline),
+    # then scale in place so only one float temporary is allocated
+    pcm = np.clip(np.ascontiguousarray(audio_np, dtype=np.float32), -1.0, 1.0)
+    np.multiply(pcm, 32767.0, out=pcm)
+    return pcm.astype(np.int16, copy=False)
+
+def _write_wav(audio_np: np.ndarray, output_path: str):
+    """Atomically write audio samples to a 16-bit PCM WAV file through a 1 MiB buffer."""
+    if audio_np.dtype != np.int16:
+        audio_np = _to_pcm16(audio_np)
+
+    # Stage beside the target and rename into place, so the file served from
+    # static/output is never seen half-written
+    tmp_path = os.path.join(os.path.dirname(output_path), f".{uuid.uuid4().hex}.wav.tmp")
+    try:
+        # A buffered handle coalesces libsndfile's small writes into few syscalls
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            sf.write(f, audio_np, SAMPLE_RATE, format='WAV', subtype='PCM_16')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def generate_audio(text: str, voice: str = None, output_path: str = "app/static/output/output.wav") -> tuple[str, float]:
     """
     Generate audio for given text and optional voice.
     Voice parameter can be either a raw voice code (e.g., 'af_bella') or a formatted display name.
-    Returns the saved file path.
+    Returns the saved file path and the audio duration in seconds.
     """
-    if voice is None:
-        voice = 'af_alloy'  # Default to American Female
-
     try:
         pipeline = _load_kokoro_model()
+        voice = _resolve_voice(pipeline, voice)
 
-        # Convert formatted voice name to raw voice code if needed
-        voice_mapping = _get_voice_mapping()
-        if voice in voice_mapping:
-            voice = voice_mapping[voice]  # Convert formatted name to raw code
+        with _generation_lock, _autocast(pipeline):
+            # Generate audio - pipeline returns a generator yielding Result objects
+            results = pipeline(text, voice=voice)
 
-        if voice not in pipeline.voices:
-            raise ValueError(f"Voice '{voice}' not available. Available: {list(pipeline.voices.keys())}")
-
-        # Generate audio - pipeline returns a generator yielding Result objects
-        results = pipeline(text, voice=voice)
+            # Collect all audio segments from the generator
+            audio_segments = [result.audio for result in results]
 
-        # Collect all audio segments from the generator
-        audio_segments = []
-        for result in results:
-            audio_segments.append(result.audio.cpu())
-
-        # Concatenate all audio segments along time axis (dimension 0)
-        if audio_segments:
-            combined_audio = torch.cat(audio_segments, dim=0)
-            audio_np = combined_audio.numpy()
-        else:
+        if not audio_segments:
             # Fallback if no results (shouldn't happen with valid input)
             raise RuntimeError("No audio generated from Kokoro pipeline")
 
+        # KModel.forward already returns host tensors, so one torch.cat along the
+        # time axis (dimension 0) is the only copy
+        combined_audio = torch.cat(audio_segments, dim=0)
+        audio_np = combined_audio.numpy()
+        duration = combined_audio.shape[0] / SAMPLE_RATE
+
         # Save the combined audio
-        sf.write(output_path, audio_np, 24000)  # Kokoro uses 24kHz
+        _write_wav(audio_np, output_path)
+
+        return output_path, duration
+
+    except Exception as e:
+        raise RuntimeError(f"Kokoro generation failed: {e}")
+
+def stream_audio(text: str, voice: str = None, output_path: str = None):
+    """
+    Generate audio segment by segment for streaming playback.
+    Yields 16-bit PCM numpy arrays as soon as each segment is synthesized.
+    If output_path is given, the combined audio is written there once the
+    last segment has been yielded, before the generator finishes.
+    """
+    try:
+        pipeline = _load_kokoro_model()
+        voice = _resolve_voice(pipeline, voice)
+        results = pipeline(text, voice=voice)
 
-        return output_path
+        segments = []
+        while True:
+            # Lock per segment so a slow client never holds up other generations
+            with _generation_lock, _autocast(pipeline):
+                result = next(results, None)
+            if result is None:
+                break
+            pcm = _to_pcm16(result.audio.cpu().numpy())
+            segments.append(pcm)
+            yield pcm
+
+        if output_path and segments:
+            _write_wav(np.concatenate(segments), output_path)
 
     except Exception as e:
         raise RuntimeError(f"Kokoro generation failed: {e}")
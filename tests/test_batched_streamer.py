@@ -0,0 +1,118 @@
+"""Tests for the BatchedStreamer request scheduler in app/app.py."""
+
+import importlib.util
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+LONG_TEXT = "x" * 600
+SHORT_TEXT = "Hi."
+
+
+@pytest.fixture
+def app_module(monkeypatch, tmp_path):
+    # app.py imports device_utils as a top-level module and edits sys.path itself;
+    # syspath_prepend restores sys.path on teardown
+    monkeypatch.syspath_prepend(str(APP_DIR))
+    spec = importlib.util.spec_from_file_location("neo_tts_app", APP_DIR / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "LOG_FILE", str(tmp_path / "results.csv"))
+    return module
+
+
+class StubModel:
+    """Records generation order; calls for gated output paths block until opened."""
+
+    def __init__(self):
+        self.order = []
+        self.started = {}
+        self.gates = {}
+
+    def gate(self, output_path):
+        self.started[output_path] = threading.Event()
+        self.gates[output_path] = threading.Event()
+
+    def generate_audio(self, text, voice, output_path):
+        if output_path in self.gates:
+            self.started[output_path].set()
+            self.gates[output_path].wait(timeout=5)
+        self.order.append(output_path)
+        return output_path, 0.0
+
+
+@pytest.fixture
+def stub(app_module, monkeypatch):
+    stub = StubModel()
+    monkeypatch.setattr(app_module, "get_model_module", lambda name: stub)
+    return stub
+
+
+@pytest.fixture
+def make_streamer(app_module):
+    streamers = []
+
+    def make(**kwargs):
+        streamer = app_module.BatchedStreamer(**kwargs)
+        streamers.append(streamer)
+        return streamer
+
+    yield make
+    for streamer in streamers:
+        streamer.close(timeout=5)
+        assert streamer._worker is None or not streamer._worker.is_alive()
+
+
+def _submit(streamer, text, output_path):
+    return streamer.submit("kokoro", text, "af_alloy", output_path)
+
+
+def _queue_behind_l0(stub, streamer):
+    """Start L0, then queue L1, S, L2..L8 while it is generating."""
+    stub.gate("L0")
+    futures = {"L0": _submit(streamer, LONG_TEXT, "L0")}
+    assert stub.started["L0"].wait(timeout=5)
+
+    futures["L1"] = _submit(streamer, LONG_TEXT, "L1")
+    futures["S"] = _submit(streamer, SHORT_TEXT, "S")
+    for i in range(2, 9):
+        futures[f"L{i}"] = _submit(streamer, LONG_TEXT, f"L{i}")
+    stub.gates["L0"].set()
+
+    for path, future in futures.items():
+        assert future.result(timeout=5)[0] == path
+
+
+def test_short_prompt_is_served_before_queued_long_prompts(stub, make_streamer):
+    _queue_behind_l0(stub, make_streamer())
+    assert stub.order == ["L0", "S"] + [f"L{i}" for i in range(1, 9)]
+
+
+def test_short_prompt_arriving_mid_backlog_waits_for_one_generation(stub, make_streamer):
+    streamer = make_streamer()
+    stub.gate("L0")
+    stub.gate("L2")
+    futures = [_submit(streamer, LONG_TEXT, "L0")]
+    assert stub.started["L0"].wait(timeout=5)
+    futures += [_submit(streamer, LONG_TEXT, f"L{i}") for i in range(1, 9)]
+    stub.gates["L0"].set()
+
+    # S arrives while the long backlog is already being served
+    assert stub.started["L2"].wait(timeout=5)
+    futures.append(_submit(streamer, SHORT_TEXT, "S"))
+    stub.gates["L2"].set()
+
+    for future in futures:
+        future.result(timeout=5)
+    assert stub.order == ["L0", "L1", "L2", "S"] + [f"L{i}" for i in range(3, 9)]
+
+
+def test_overdue_requests_are_served_oldest_first(stub, make_streamer):
+    # With no wait allowance the oldest request always wins, i.e. plain FIFO
+    _queue_behind_l0(stub, make_streamer(max_wait=0.0))
+    assert stub.order == ["L0", "L1", "S"] + [f"L{i}" for i in range(2, 9)]